@@ -0,0 +1,97 @@
+# archive_query.py
+# Query agregat historis dari arsip Parquet (lihat archiver.py) tanpa menyentuh MongoDB.
+# Filter perangkat/tanggal dipangkas di level partisi, lalu agregasi dilakukan
+# di Arrow per batch sehingga memori tidak bergantung pada jumlah baris mentah.
+import os
+from datetime import date, timedelta
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from archiver import ARCHIVE_DIR
+
+# Frekuensi agregasi yang didukung -> unit pembulatan waktu Arrow
+FREQUENCIES = {"day": "day", "week": "week", "month": "month"}
+VALUE_COLUMNS = ["temp", "hum", "light", "sound"]
+OUTPUT_NAMES = {"temp": "avgTemp", "hum": "avgHum", "light": "avgLight", "sound": "avgSound"}
+GROUP_KEYS = ["device_id", "room", "period"]
+DEFAULT_HISTORY_DAYS = 30   # Rentang bawaan jika start tidak diberikan
+MAX_HISTORY_DAYS = 200      # Rentang maksimum satu query (kurang lebih satu semester)
+# Tipe partisi ditetapkan agar ID perangkat numerik tidak terbaca sebagai integer
+PARTITIONING = ds.partitioning(
+    pa.schema([("device_id", pa.string()), ("date", pa.string())]), flavor="hive"
+)
+
+
+def _dataset():
+    return ds.dataset(ARCHIVE_DIR, format="parquet", partitioning=PARTITIONING)
+
+
+def _partial_aggregate(batch, unit):
+    """Jumlah dan cacah per grup untuk satu batch; rata-rata dihitung setelah digabung"""
+    period = pc.floor_temporal(batch.column("timestamp"), unit=unit, week_starts_monday=True)
+    table = pa.table({
+        "device_id": batch.column("device_id"),
+        "room": batch.column("room"),
+        "period": period.cast(pa.date32()),
+        "motion": batch.column("motion").cast(pa.int64()),
+        **{column: batch.column(column).cast(pa.float64()) for column in VALUE_COLUMNS},
+    })
+    aggregations = [("motion", "sum"), ("motion", "count")]
+    for column in VALUE_COLUMNS:
+        aggregations += [(column, "sum"), (column, "count")]
+    return table.group_by(GROUP_KEYS).aggregate(aggregations)
+
+
+def query_history(device_id=None, start=None, end=None, freq="day"):
+    """Rata-rata per perangkat, ruangan dan periode dari arsip.
+
+    start/end adalah objek date (inklusif); tanpa start dipakai DEFAULT_HISTORY_DAYS
+    hari terakhir sebelum end, dan rentang dibatasi MAX_HISTORY_DAYS.
+    freq salah satu dari FREQUENCIES.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"freq harus salah satu dari: {', '.join(FREQUENCIES)}")
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_HISTORY_DAYS - 1)
+    if start > end:
+        raise ValueError("start harus sebelum atau sama dengan end")
+    if (end - start).days + 1 > MAX_HISTORY_DAYS:
+        raise ValueError(f"Rentang maksimal {MAX_HISTORY_DAYS} hari")
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+
+    # Kolom partisi 'date' berformat ISO sehingga perbandingan string sama dengan urutan tanggal
+    expr = (ds.field("date") >= start.isoformat()) & (ds.field("date") <= end.isoformat())
+    if device_id:
+        expr = expr & (ds.field("device_id") == device_id)
+
+    scanner = _dataset().scanner(
+        columns=["device_id", "room", "timestamp", "motion", *VALUE_COLUMNS], filter=expr
+    )
+    partials = [
+        _partial_aggregate(batch, FREQUENCIES[freq])
+        for batch in scanner.to_batches() if batch.num_rows
+    ]
+    if not partials:
+        return []
+
+    # Gabungkan jumlah/cacah parsial dari semua batch
+    combined = pa.concat_tables(partials)
+    sum_columns = [name for name in combined.column_names if name not in GROUP_KEYS]
+    totals = combined.group_by(GROUP_KEYS).aggregate([(name, "sum") for name in sum_columns])
+    totals = totals.sort_by([(key, "ascending") for key in GROUP_KEYS])
+
+    result = {
+        "device_id": totals.column("device_id"),
+        "room": totals.column("room"),
+        "period": totals.column("period").cast(pa.string()),
+    }
+    for column in VALUE_COLUMNS:
+        count = totals.column(f"{column}_count_sum")
+        mean = pc.divide(totals.column(f"{column}_sum_sum"), pc.if_else(pc.equal(count, 0), None, count))
+        result[OUTPUT_NAMES[column]] = pc.round(mean, 2)
+    result["motionCount"] = totals.column("motion_sum_sum")
+    result["count"] = totals.column("motion_count_sum")
+    return pa.table(result).to_pylist()
@@ -0,0 +1,134 @@
+# bench_ingest.py
+# Micro-benchmark CPU per request untuk handler ingest dan latest di flask_app.
+# Koleksi MongoDB diganti koleksi in-memory agar yang terukur hanya overhead handler.
+#
+# Jalankan: python bench_ingest.py [jumlah_iterasi]
+import json
+import sys
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from flask import jsonify
+
+import flask_app
+
+
+class InMemoryCollection:
+    """Pengganti sensor_collection: insert_one dan find().sort().limit() tanpa I/O"""
+    def __init__(self):
+        self.docs = []
+
+    def insert_one(self, doc):
+        doc["_id"] = ObjectId()
+        self.docs.append(doc)
+        return type("InsertResult", (), {"inserted_id": doc["_id"]})()
+
+    def find(self, query=None):
+        return self
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return [dict(doc) for doc in self.docs[-n:]]
+
+
+class InMemoryCounters:
+    """Pengganti counters_collection untuk versi ingest"""
+    def __init__(self):
+        self.doc = None
+
+    def find_one_and_update(self, query, update, **kwargs):
+        version = (self.doc or {}).get("version", 0) + 1
+        self.doc = {"_id": query["_id"], "version": version, "updated_at": datetime.utcnow()}
+        return self.doc
+
+    def find_one(self, query):
+        return self.doc
+
+
+PAYLOAD = {
+    "temp": 25.0,
+    "hum": 55.0,
+    "light": 62.3,
+    "motion": 1,
+    "sound": 31.8,
+    "timestamp": "2025-01-01 07:00:00 WIB",
+    "device": "ESP32-Sensor",
+    "room": "X-IPA-1",
+}
+HEADERS = {"X-API-KEY": "EduNudgeAI"}
+
+
+def legacy_ingest(data):
+    """Jalur lama: request.json (json stdlib) + spread dict + jsonify"""
+    sensor_data = {**data, "timestamp": datetime.now(), "device_type": "ESP32-Sensor"}
+    sensor_data["_id"] = ObjectId()
+    return jsonify({"status": "success", "message": "Data saved", "id": str(sensor_data["_id"])})
+
+
+def new_ingest(body):
+    """Jalur baru: orjson + validator terkompilasi + json_response"""
+    sensor_data = flask_app.validate_sensor_data(flask_app.orjson.loads(body))
+    sensor_data["timestamp"] = datetime.now()
+    sensor_data["_id"] = ObjectId()
+    return flask_app.json_response(
+        {"status": "success", "message": "Data saved", "id": str(sensor_data["_id"])}, 201)
+
+
+def legacy_latest(data):
+    """Jalur lama: mutasi _id/timestamp per dokumen lalu jsonify"""
+    for item in data:
+        item['_id'] = str(item['_id'])
+        item['timestamp'] = item['timestamp'].isoformat()
+    return jsonify({"status": "success", "count": len(data), "data": data})
+
+
+def measure(label, fn, iterations):
+    fn()  # pemanasan
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.process_time() - start
+    print(f"{label:<32} {elapsed / iterations * 1e6:8.1f} us/request")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = flask_app.app
+    flask_app.sensor_collection = InMemoryCollection()
+    flask_app.counters_collection = InMemoryCounters()
+    flask_app.app.logger.disabled = True
+    client = app.test_client()
+
+    for _ in range(10):
+        client.post("/api/sensor", json=PAYLOAD, headers=HEADERS)
+
+    print(f"Iterasi: {iterations}")
+    measure("POST /api/sensor (test client)",
+            lambda: client.post("/api/sensor", json=PAYLOAD, headers=HEADERS), iterations)
+    measure("GET /api/sensor/latest (client)",
+            lambda: client.get("/api/sensor/latest"), iterations)
+    etag = client.get("/api/sensor/latest").headers["ETag"]
+    measure("GET /api/sensor/latest (304)",
+            lambda: client.get("/api/sensor/latest", headers={"If-None-Match": etag}), iterations)
+
+    # Bandingkan inti handler tanpa overhead routing test client
+    with app.test_request_context("/api/sensor", method="POST", json=PAYLOAD, headers=HEADERS):
+        body = flask_app.orjson.dumps(PAYLOAD)
+        measure("ingest lama (json + spread)",
+                lambda: legacy_ingest(json.loads(body)), iterations)
+        measure("ingest baru (orjson + skema)",
+                lambda: new_ingest(body), iterations)
+
+        docs = flask_app.sensor_collection.limit(10)
+        measure("latest lama (mutasi + jsonify)",
+                lambda: legacy_latest([dict(d) for d in docs]), iterations)
+        measure("latest baru (orjson)",
+                lambda: flask_app.json_response({"status": "success", "count": len(docs),
+                                                 "data": [dict(d) for d in docs]}), iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# bench_server.py
+# Membandingkan throughput dan latensi API sensor antara server debug Flask
+# (python flask_app.py) dan gunicorn (gunicorn -c gunicorn.conf.py).
+# Membutuhkan MongoDB yang berjalan sesuai MONGO_URI.
+#
+# Jalankan: python bench_server.py [debug|gunicorn|all] [jumlah_request] [konkurensi]
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://127.0.0.1:5001"
+ENDPOINTS = ["/healthz", "/api/sensor/latest", "/api/sensor/overview"]
+SERVERS = {
+    "debug": [sys.executable, "flask_app.py"],
+    "gunicorn": ["gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+}
+
+
+def start_server(name):
+    proc = subprocess.Popen(
+        SERVERS[name],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{BASE_URL}/readyz", timeout=1).status_code == 200:
+                return proc
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_server(proc)
+    raise RuntimeError(f"Server {name} tidak siap dalam 30 detik")
+
+
+def stop_server(proc):
+    # Server debug menjalankan reloader sebagai proses anak, hentikan seluruh grup
+    os.killpg(proc.pid, signal.SIGTERM)
+    proc.wait(timeout=10)
+
+
+def run_load(endpoint, total, concurrency):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+
+    def one(_):
+        t0 = time.perf_counter()
+        res = session.get(f"{BASE_URL}{endpoint}", timeout=10)
+        return time.perf_counter() - t0, res.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    errors = sum(1 for r in results if r[1] >= 400)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+    print(f"  {endpoint:<24} {total / elapsed:8.1f} req/s  "
+          f"p50 {pct(0.50):6.1f} ms  p95 {pct(0.95):6.1f} ms  p99 {pct(0.99):6.1f} ms  "
+          f"error {errors}")
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else "all"
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+
+    names = list(SERVERS) if target == "all" else [target]
+    for name in names:
+        print(f"[{name}] {total} request, konkurensi {concurrency}")
+        proc = start_server(name)
+        try:
+            for endpoint in ENDPOINTS:
+                run_load(endpoint, total, concurrency)
+        finally:
+            stop_server(proc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_startup.py
+# Mengukur waktu import (cold start) flask_app dan streamlit_app di proses Python baru,
+# beserta modul dengan waktu import kumulatif terbesar (python -X importtime).
+#
+# Jalankan: python bench_startup.py [jumlah_ulangan] [jumlah_modul_teratas]
+import os
+import statistics
+import subprocess
+import sys
+
+TARGETS = ["flask_app", "streamlit_app"]
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SNIPPET = "import time; t0 = time.perf_counter(); import {module}; print(time.perf_counter() - t0)"
+
+
+def measure_import(module, repeat):
+    durations = []
+    for _ in range(repeat):
+        res = subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if res.returncode != 0:
+            raise RuntimeError(f"Import {module} gagal:\n{res.stderr.strip()}")
+        durations.append(float(res.stdout.strip().splitlines()[-1]))
+    return durations
+
+
+def top_imports(module, top):
+    """Import langsung milik module dengan waktu kumulatif terbesar (python -X importtime)"""
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    entries = []
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(cumulative_us), name.strip()))
+
+    # importtime mencetak anak sebelum induknya: ambil entri kedalaman 1 di antara
+    # baris module dan entri kedalaman 0 sebelumnya
+    rows = []
+    collecting = False
+    for depth, cumulative_us, name in reversed(entries):
+        if depth == 0:
+            if collecting:
+                break
+            collecting = name == module
+        elif depth == 1 and collecting:
+            rows.append((cumulative_us, name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    for module in TARGETS:
+        durations = measure_import(module, repeat)
+        print(f"{module}: median {statistics.median(durations) * 1000:.0f} ms, "
+              f"min {min(durations) * 1000:.0f} ms, maks {max(durations) * 1000:.0f} ms ({repeat}x)")
+        for cumulative_us, name in top_imports(module, top):
+            print(f"  {name:<40} {cumulative_us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
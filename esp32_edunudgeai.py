@@ -97,6 +97,10 @@ try:
     FLASK_API_URL = config["api"]["url"]
     API_KEY = config["api"]["key"]
 
+    # Identitas perangkat dan ruangan (opsional) untuk dashboard multi-kelas
+    DEVICE_ID = config["api"].get("device_id", "ESP32-Sensor")
+    ROOM = config["api"].get("room", DEVICE_ID)
+
     # Validasi konfigurasi penting
     if not all([MQTT_SERVER, MQTT_TOKEN, FLASK_API_URL]):
         raise ValueError("Konfigurasi penting kosong, periksa config.json")
@@ -349,7 +353,8 @@ def send_to_mongodb(temp, hum, light, motion, sound):
             "motion": motion,
             "sound": sound,
             "timestamp": timestamp,
-            "device": "ESP32-Sensor"
+            "device": DEVICE_ID,
+            "room": ROOM
         }
         
         # Simpan data terakhir
@@ -0,0 +1,557 @@
+# esp32_simulator.py
+# Simulator host (Linux) untuk esp32_edunudgeai.py. Modul MicroPython (machine,
+# network, dht, ssd1306, umqtt, urequests, ntptime) diganti versi palsu dengan jam
+# virtual, trace sensor terjadwal dan gangguan jaringan, lalu main() asli dijalankan
+# untuk mengukur waktu per iterasi, alokasi memori dan biaya gc.collect().
+#
+# Jalankan: python esp32_simulator.py --iterations 300 --wifi-down 60:90 --latency-ms 250
+#           python esp32_simulator.py --trace trace.csv
+# Format trace CSV: t,temp,hum,light_raw,sound_raw,motion (t dalam detik virtual;
+# baris terakhir dengan t <= waktu sekarang yang dipakai, kolom kosong = DHT error)
+import argparse
+import contextlib
+import csv
+import io
+import gc as real_gc
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time as real_time
+import tracemalloc
+import types
+from datetime import datetime, timedelta, timezone
+
+FIRMWARE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "esp32_edunudgeai.py")
+EPOCH_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class SimulationDone(BaseException):
+    """Menghentikan main(); BaseException agar tidak tertangkap 'except Exception' di firmware"""
+
+
+class SimulatedReset(BaseException):
+    """machine.reset() dipanggil firmware"""
+
+
+# ========== JAM VIRTUAL ==========
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0  # Detik virtual sejak EPOCH_START
+        self.blocked = {}  # Kategori -> total detik virtual yang dihabiskan untuk menunggu
+        self.on_sleep = None
+
+    def advance(self, seconds, category):
+        self.now += seconds
+        self.blocked[category] = self.blocked.get(category, 0.0) + seconds
+
+
+def make_time_module(clock):
+    """Modul 'time' MicroPython di atas jam virtual"""
+    mod = types.ModuleType("time")
+
+    def sleep(seconds):
+        caller = sys._getframe(1).f_code
+        if clock.on_sleep:
+            clock.on_sleep(seconds, caller)
+        clock.advance(seconds, _sleep_category(seconds, caller))
+
+    mod.sleep = sleep
+    mod.sleep_ms = lambda ms: sleep(ms / 1000)
+    mod.time = lambda: int(EPOCH_START.timestamp() + clock.now)
+    mod.ticks_ms = lambda: int(clock.now * 1000)
+    mod.ticks_diff = lambda a, b: a - b
+    mod.localtime = lambda secs=None: real_time.gmtime(EPOCH_START.timestamp() + clock.now)
+    return mod
+
+
+def _sleep_category(seconds, caller):
+    if caller.co_name == "main":
+        return {0.5: "buzzer", 1: "loop", 2: "startup", 5: "error"}.get(seconds, "main")
+    return caller.co_name
+
+
+# ========== PERANGKAT KERAS PALSU ==========
+class SensorTrace:
+    """Nilai sensor per detik virtual, dari CSV atau pola sintetis"""
+    def __init__(self, clock, path=None, seed=0):
+        self.clock = clock
+        self.rows = []
+        self.rng = random.Random(seed)
+        if path:
+            with open(path, newline="") as f:
+                for row in csv.DictReader(f):
+                    self.rows.append({k: (float(v) if v not in ("", None) else None) for k, v in row.items()})
+            self.rows.sort(key=lambda r: r["t"])
+
+    def sample(self):
+        t = self.clock.now
+        if self.rows:
+            current = self.rows[0]
+            for row in self.rows:
+                if row["t"] > t:
+                    break
+                current = row
+            return current
+        # Pola sintetis: suhu/kelembaban berayun, cahaya kadang gelap, gerakan periodik
+        return {
+            "temp": 25 + 3 * math.sin(t / 600),
+            "hum": 55 + 10 * math.sin(t / 900),
+            "light_raw": 300 if int(t) % 120 < 10 else 2500,
+            "sound_raw": 1200 + self.rng.randint(-400, 400),
+            "motion": 1.0 if int(t) % 45 < 2 else 0.0,
+        }
+
+
+class FakePin:
+    IN = 1
+    OUT = 3
+
+    def __init__(self, pin_id, mode=None, sim=None):
+        self.id = pin_id
+        self.mode = mode
+        self.sim = sim
+        self._value = 0
+
+    def value(self, v=None):
+        if v is None:
+            if self.id == 27:  # PIR
+                return int(self.sim.trace.sample()["motion"] or 0)
+            return self._value
+        self._value = v
+
+
+class FakeADC:
+    ATTN_11DB = 3
+    WIDTH_12BIT = 3
+
+    def __init__(self, pin, sim=None):
+        self.pin = pin
+        self.sim = sim
+
+    def atten(self, value):
+        pass
+
+    def width(self, value):
+        pass
+
+    def read(self):
+        key = "light_raw" if self.pin.id == 34 else "sound_raw"
+        return int(self.sim.trace.sample()[key])
+
+
+class FakeRTC:
+    def __init__(self, clock):
+        self.clock = clock
+        self.offset = 0.0
+
+    def datetime(self, value=None):
+        if value is not None:
+            year, month, day, _, hour, minute, second, _ = value
+            target = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+            self.offset = (target - EPOCH_START).total_seconds() - self.clock.now
+            return
+        current = EPOCH_START + timedelta(seconds=self.clock.now + self.offset)
+        return (current.year, current.month, current.day, current.weekday(),
+                current.hour, current.minute, current.second, 0)
+
+
+class FakeDisplay:
+    def __init__(self, *args, **kwargs):
+        self.lines = []
+        self.frames = 0
+
+    def fill(self, color):
+        self.lines = []
+
+    def text(self, text, x, y):
+        self.lines.append(text)
+
+    def show(self):
+        self.frames += 1
+
+
+class FakeDHT11:
+    def __init__(self, pin, sim=None):
+        self.sim = sim
+        self.row = None
+
+    def measure(self):
+        self.row = self.sim.trace.sample()
+        if self.row["temp"] is None or self.row["hum"] is None:
+            raise OSError("ETIMEDOUT")
+
+    def temperature(self):
+        return int(self.row["temp"])
+
+    def humidity(self):
+        return int(self.row["hum"])
+
+
+class FakeWLAN:
+    def __init__(self, iface, sim=None):
+        self.sim = sim
+        self.connected = False
+
+    def active(self, state=None):
+        return True
+
+    def disconnect(self):
+        self.connected = False
+
+    def connect(self, ssid, password):
+        self.connected = True
+
+    def isconnected(self):
+        return self.connected and self.sim.network_up()
+
+    def config(self, **kwargs):
+        pass
+
+
+class FakeResponse:
+    status_code = 201
+
+    def close(self):
+        pass
+
+
+class FakeMQTTClient:
+    def __init__(self, client_id, server, user=None, password=None, sim=None):
+        self.sim = sim
+
+    def connect(self):
+        self.sim.network_call("mqtt")
+
+    def publish(self, topic, payload):
+        self.sim.network_call("mqtt")
+        self.sim.stats["mqtt_sent"] += 1
+
+
+class FakeSocket:
+    def bind(self, addr):
+        pass
+
+    def listen(self, backlog):
+        pass
+
+    def accept(self):
+        # Mode AP menunggu konfigurasi dari browser tanpa batas waktu
+        raise SimulationDone("firmware masuk mode AP (WiFi tidak tersedia)")
+
+
+class TimedGC:
+    """Pengganti modul gc yang mengukur durasi setiap collect()"""
+    def __init__(self):
+        self.durations = []
+
+    def collect(self):
+        t0 = real_time.perf_counter()
+        real_gc.collect()
+        self.durations.append(real_time.perf_counter() - t0)
+
+    def mem_free(self):
+        return 0
+
+
+# ========== SIMULATOR ==========
+class Simulator:
+    def __init__(self, iterations, trace_path=None, wifi_down=(), latency_ms=100,
+                 http_fail_rate=0.0, seed=0, trace_alloc=True, verbose=False):
+        self.iterations = iterations
+        self.clock = VirtualClock()
+        self.trace = SensorTrace(self.clock, trace_path, seed)
+        self.wifi_down = wifi_down
+        self.latency = latency_ms / 1000
+        self.http_fail_rate = http_fail_rate
+        self.rng = random.Random(seed)
+        self.trace_alloc = trace_alloc
+        self.verbose = verbose
+        self.gc = TimedGC()
+        self.stats = {"mongo_sent": 0, "mongo_failed": 0, "mqtt_sent": 0, "threads": 0}
+        self.iteration_records = []
+        self.fmt_time_calls = []
+        self.fw = None
+
+    def network_up(self):
+        return not any(start <= self.clock.now < end for start, end in self.wifi_down)
+
+    def network_call(self, kind):
+        self.clock.advance(self.latency, "network")
+        if not self.network_up():
+            raise OSError("ECONNABORTED")
+        if kind == "http" and self.rng.random() < self.http_fail_rate:
+            raise OSError("ECONNRESET")
+
+    # ---------- Modul palsu ----------
+    def fake_modules(self):
+        sim = self
+        machine = types.ModuleType("machine")
+        machine.Pin = lambda pin_id, mode=None: FakePin(pin_id, mode, sim)
+        machine.Pin.IN, machine.Pin.OUT = FakePin.IN, FakePin.OUT
+        machine.ADC = lambda pin: FakeADC(pin, sim)
+        machine.ADC.ATTN_11DB, machine.ADC.WIDTH_12BIT = FakeADC.ATTN_11DB, FakeADC.WIDTH_12BIT
+        machine.SoftI2C = lambda scl=None, sda=None: None
+        machine.RTC = lambda: self.rtc
+        machine.reset = self._reset
+
+        ssd1306 = types.ModuleType("ssd1306")
+        ssd1306.SSD1306_I2C = FakeDisplay
+
+        dht = types.ModuleType("dht")
+        dht.DHT11 = lambda pin: FakeDHT11(pin, sim)
+
+        network = types.ModuleType("network")
+        network.STA_IF, network.AP_IF, network.AUTH_WPA_WPA2_PSK = 0, 1, 3
+        network.WLAN = lambda iface: FakeWLAN(iface, sim)
+
+        umqtt = types.ModuleType("umqtt")
+        umqtt_simple = types.ModuleType("umqtt.simple")
+        umqtt_simple.MQTTClient = lambda *args, **kwargs: FakeMQTTClient(*args, sim=sim, **kwargs)
+        umqtt.simple = umqtt_simple
+
+        urequests = types.ModuleType("urequests")
+        urequests.post = self._http_post
+
+        ntptime = types.ModuleType("ntptime")
+        ntptime.settime = self._ntp_settime
+
+        socket = types.ModuleType("socket")
+        socket.getaddrinfo = lambda host, port: [(None, None, None, None, (host, port))]
+        socket.socket = FakeSocket
+
+        _thread = types.ModuleType("_thread")
+        _thread.start_new_thread = self._start_thread
+
+        return {
+            "machine": machine, "ssd1306": ssd1306, "dht": dht, "network": network,
+            "umqtt": umqtt, "umqtt.simple": umqtt_simple, "urequests": urequests,
+            "ntptime": ntptime, "socket": socket, "ujson": json, "_thread": _thread,
+            "gc": self.gc, "time": make_time_module(self.clock),
+        }
+
+    def _reset(self):
+        raise SimulatedReset("machine.reset()")
+
+    def _http_post(self, url, json=None, headers=None):
+        try:
+            self.network_call("http")
+        except OSError:
+            self.stats["mongo_failed"] += 1
+            raise
+        self.stats["mongo_sent"] += 1
+        return FakeResponse()
+
+    def _ntp_settime(self):
+        self.network_call("ntp")
+        self.rtc.offset = 0.0
+
+    def _start_thread(self, func, args):
+        # Thread monitor WiFi tidak dijalankan; perilakunya diemulasikan di _wifi_monitor_step
+        self.stats["threads"] += 1
+
+    def _wifi_monitor_step(self):
+        """Satu langkah check_wifi_status() tanpa loop dan sleep-nya"""
+        fw = self.fw
+        if fw.wlan and fw.wlan.isconnected():
+            if not fw.wifi_connected:
+                fw.wifi_connected = True
+                fw.LED_WIFI.value(1)
+                fw.connect_mqtt()
+                fw.sync_ntp()
+        elif fw.wifi_connected:
+            fw.wifi_connected = False
+            fw.LED_WIFI.value(0)
+
+    # ---------- Memuat firmware ----------
+    def load_firmware(self, workdir):
+        self.rtc = FakeRTC(self.clock)
+        with open(os.path.join(workdir, "config.json"), "w") as f:
+            json.dump({
+                "mqtt": {"server": "sim-broker", "token": "sim-token", "device_label": "sim", "topic": "sim/topic"},
+                "api": {"url": "http://sim/api/sensor", "key": "EduNudgeAI", "device_id": "SIM-1", "room": "Simulator"},
+            }, f)
+        with open(os.path.join(workdir, "wifi_config.json"), "w") as f:
+            json.dump({"ssid": "sim", "password": "sim-password"}, f)
+
+        with open(FIRMWARE_PATH) as f:
+            code = compile(f.read(), FIRMWARE_PATH, "exec")
+        fw = types.ModuleType("esp32_edunudgeai")
+        fw.__file__ = FIRMWARE_PATH
+
+        fakes = self.fake_modules()
+        saved = {name: sys.modules.get(name) for name in fakes}
+        sys.modules.update(fakes)
+        try:
+            exec(code, fw.__dict__)
+        finally:
+            for name, module in saved.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+        self.fw = fw
+
+        # Hitung biaya get_formatted_time() di dalam firmware
+        original = fw.get_formatted_time
+
+        def timed_formatted_time():
+            t0 = real_time.perf_counter()
+            result = original()
+            self.fmt_time_calls.append(real_time.perf_counter() - t0)
+            return result
+        fw.get_formatted_time = timed_formatted_time
+
+    # ---------- Pencatatan per iterasi ----------
+    def _on_sleep(self, seconds, caller):
+        if caller.co_name != "main" or caller.co_filename != FIRMWARE_PATH or seconds not in (1, 5):
+            return
+        # sleep(1)/sleep(5) di main() menandai akhir satu iterasi loop utama
+        now = real_time.perf_counter()
+        record = {
+            "cpu": now - self._iter_cpu_start,
+            "virtual": self.clock.now + seconds - self._iter_virtual_start,
+            "blocked": {k: v - self._iter_blocked.get(k, 0.0) for k, v in self.clock.blocked.items()},
+            "fmt_calls": len(self.fmt_time_calls) - self._iter_fmt_calls,
+            "gc": sum(self.gc.durations[self._iter_gc:]),
+            "error": seconds == 5,
+        }
+        if self.trace_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            record["alloc_peak"] = peak - self._iter_mem_start
+            if len(self.iteration_records) == 0:
+                self.snapshot_start = tracemalloc.take_snapshot()
+        category = _sleep_category(seconds, caller)
+        record["blocked"][category] = record["blocked"].get(category, 0.0) + seconds
+        self.iteration_records.append(record)
+
+        if len(self.iteration_records) >= self.iterations:
+            if self.trace_alloc:
+                self.snapshot_end = tracemalloc.take_snapshot()
+            raise SimulationDone(f"{self.iterations} iterasi selesai")
+
+        self._wifi_monitor_step()
+        self._start_iteration(seconds, category)
+
+    def _start_iteration(self, pending_sleep=0, category=None):
+        # Sleep penutup iterasi sebelumnya belum masuk ke jam saat fungsi ini dipanggil
+        self._iter_virtual_start = self.clock.now + pending_sleep
+        self._iter_blocked = dict(self.clock.blocked)
+        if category:
+            self._iter_blocked[category] = self._iter_blocked.get(category, 0.0) + pending_sleep
+        self._iter_fmt_calls = len(self.fmt_time_calls)
+        self._iter_gc = len(self.gc.durations)
+        if self.trace_alloc:
+            tracemalloc.reset_peak()
+            self._iter_mem_start = tracemalloc.get_traced_memory()[0]
+        self._iter_cpu_start = real_time.perf_counter()
+
+    def run(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                self.load_firmware(workdir)
+                if self.trace_alloc:
+                    tracemalloc.start()
+                self.clock.on_sleep = self._on_sleep
+                self._start_iteration()
+                # Output print() firmware disembunyikan kecuali --verbose
+                output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+                try:
+                    with output:
+                        self.fw.main()
+                except (SimulationDone, SimulatedReset) as e:
+                    self.stop_reason = str(e)
+            finally:
+                if self.trace_alloc:
+                    tracemalloc.stop()
+                os.chdir(cwd)
+        return self.report()
+
+    # ---------- Laporan ----------
+    def report(self):
+        print(f"Simulasi berhenti: {self.stop_reason}")
+        if not self.iteration_records:
+            print("Tidak ada iterasi loop utama yang selesai.")
+            return self.iteration_records
+        # Iterasi pertama memuat startup (koneksi WiFi, NTP, MQTT), tidak ikut statistik
+        records = self.iteration_records[1:] or self.iteration_records
+
+        virtual = [r["virtual"] for r in records]
+        cpu_us = [r["cpu"] * 1e6 for r in records]
+        n = len(records)
+        p95 = lambda values: sorted(values)[min(n - 1, int(n * 0.95))]
+
+        print(f"Iterasi: {n} (error: {sum(r['error'] for r in records)}), waktu virtual: {self.clock.now:.1f} s")
+        print(f"Cadence sampel: rata-rata {statistics.mean(virtual):.3f} s, p95 {p95(virtual):.3f} s, "
+              f"maks {max(virtual):.3f} s (nominal 1.000 s)")
+
+        print("Waktu blok per iterasi (rata-rata):")
+        categories = sorted({k for r in records for k in r["blocked"]})
+        for category in categories:
+            values = [r["blocked"].get(category, 0.0) for r in records]
+            if any(values):
+                print(f"  {category:<20} {statistics.mean(values):.3f} s  (maks {max(values):.3f} s)")
+
+        print(f"CPU host per iterasi: rata-rata {statistics.mean(cpu_us):.1f} us, p95 {p95(cpu_us):.1f} us")
+        if self.fmt_time_calls:
+            print(f"get_formatted_time(): {statistics.mean(r['fmt_calls'] for r in records):.1f} panggilan/iterasi, "
+                  f"{statistics.mean(self.fmt_time_calls) * 1e6:.1f} us/panggilan")
+        if self.gc.durations:
+            gc_us = [d * 1e6 for d in self.gc.durations]
+            print(f"gc.collect(): {len(gc_us)} panggilan, rata-rata {statistics.mean(gc_us):.1f} us, "
+                  f"maks {max(gc_us):.1f} us")
+
+        if self.trace_alloc:
+            peaks = [r["alloc_peak"] for r in records]
+            print(f"Alokasi puncak per iterasi: rata-rata {statistics.mean(peaks):.0f} B, maks {max(peaks)} B")
+            if hasattr(self, "snapshot_end"):
+                diff = self.snapshot_end.compare_to(self.snapshot_start, "lineno")
+                diff = [d for d in diff if d.traceback[0].filename == FIRMWARE_PATH and d.size_diff]
+                if diff:
+                    print("Pertumbuhan memori per baris firmware:")
+                    for stat in diff[:5]:
+                        frame = stat.traceback[0]
+                        print(f"  baris {frame.lineno:<5} {stat.size_diff:+d} B ({stat.count_diff:+d} objek)")
+
+        print(f"Terkirim: MongoDB {self.stats['mongo_sent']} (gagal {self.stats['mongo_failed']}), "
+              f"MQTT {self.stats['mqtt_sent']}; frame OLED: {self.fw.display.frames}")
+        return records
+
+
+def parse_window(value):
+    start, end = value.split(":")
+    return float(start), float(end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulator host untuk firmware EduNudge AI")
+    parser.add_argument("--iterations", type=int, default=120, help="Jumlah iterasi loop utama")
+    parser.add_argument("--trace", help="CSV trace sensor (t,temp,hum,light_raw,sound_raw,motion)")
+    parser.add_argument("--wifi-down", type=parse_window, action="append", default=[],
+                        metavar="START:END", help="Jendela WiFi mati dalam detik virtual (boleh berulang)")
+    parser.add_argument("--latency-ms", type=float, default=100, help="Latensi setiap panggilan jaringan")
+    parser.add_argument("--http-fail-rate", type=float, default=0.0, help="Peluang POST ke API gagal (0-1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-alloc", action="store_true", help="Matikan tracemalloc (CPU lebih akurat)")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan output print() firmware")
+    args = parser.parse_args()
+
+    Simulator(
+        iterations=args.iterations,
+        trace_path=args.trace,
+        wifi_down=args.wifi_down,
+        latency_ms=args.latency_ms,
+        http_fail_rate=args.http_fail_rate,
+        seed=args.seed,
+        trace_alloc=not args.no_alloc,
+        verbose=args.verbose,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
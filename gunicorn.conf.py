@@ -0,0 +1,40 @@
+# gunicorn.conf.py
+# Entry point produksi untuk API sensor:
+#   gunicorn -c gunicorn.conf.py
+# Semua nilai dapat di-override lewat environment variable.
+import multiprocessing
+import os
+
+wsgi_app = "flask_app:create_app()"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5001")
+
+# Worker sinkron dengan thread: handler sebagian besar menunggu I/O MongoDB
+worker_class = "gthread"
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# App dimuat setelah fork agar MongoClient dibuat di masing-masing worker
+preload_app = False
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Restart worker berkala untuk membatasi pertumbuhan memori
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """Ukur pool MongoDB dari jumlah thread efektif (termasuk --threads di CLI).
+
+    Dijalankan di proses worker sebelum flask_app di-import, jadi init_mongo()
+    membaca nilai ini. MONGO_MAX_POOL_SIZE yang diset eksplisit tidak ditimpa.
+    """
+    if "MONGO_MAX_POOL_SIZE" not in os.environ:
+        # Cukup untuk semua thread ditambah cadangan
+        os.environ["MONGO_MAX_POOL_SIZE"] = str(worker.cfg.threads * 2)
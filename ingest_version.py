@@ -0,0 +1,20 @@
+# ingest_version.py
+# Versi ingest per koleksi, disimpan di koleksi 'counters' sebagai
+# {"_id": <nama koleksi>, "version": <int>, "updated_at": <datetime UTC>}.
+# Dinaikkan setiap kali isi koleksi berubah (ingest di flask_app, hapus di archiver)
+# dan dipakai sebagai ETag endpoint baca.
+from datetime import datetime, timezone
+
+from pymongo import ReturnDocument
+
+COUNTERS_COLLECTION = "counters"
+
+
+def bump_version(counters, collection_name="sensor_data"):
+    """Naikkan versi koleksi dan kembalikan dokumen counter yang baru"""
+    return counters.find_one_and_update(
+        {"_id": collection_name},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
@@ -2,11 +2,13 @@
 import streamlit as st
 import requests
 import pandas as pd
-import plotly.express as px
 import time
-import google.generativeai as genai
+from contextlib import contextmanager
 import re
 
+# plotly dan google.generativeai dimuat saat pertama dibutuhkan agar halaman
+# bisa tampil sebelum modul besar tersebut selesai di-import
+
 # ========== KONFIGURASI ==========
 st.set_page_config(
     page_title="EduNudge AI - Smart Classroom",
@@ -49,6 +51,7 @@ class GeminiRecommendationEngine:
             self.enabled = False
             return
         try:
+            import google.generativeai as genai
             genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
             available_models = [m.name for m in genai.list_models()]
             self.model_name = "models/gemini-1.5-pro-latest" if "models/gemini-1.5-pro-latest" in available_models else "models/gemini-pro"
@@ -85,25 +88,39 @@ class GeminiRecommendationEngine:
 
 # ========== DASHBOARD ==========
 def main():
+    profiler = RenderProfiler()
     st.title("🏫 EduNudge AI – Smart Classroom Dashboard")
-    engine = GeminiRecommendationEngine()
 
     with st.sidebar:
         st.header("⚙️ Konfigurasi")
         SERVER_URL = st.text_input("URL API Sensor", "http://localhost:5001")
         REFRESH_INTERVAL = st.slider("Interval Refresh (detik)", 5, 60, 15)
+        VIEW_MODE = st.radio("Tampilan", ["Satu Kelas", "Semua Kelas"], horizontal=True)
+        DEVICE_ID = st.text_input("ID Perangkat (opsional)", "") if VIEW_MODE == "Satu Kelas" else ""
+        SHOW_GAUGES = st.checkbox("Tampilkan gauge", value=True)
+        SHOW_PROFILER = st.checkbox("Tampilkan profil render", value=False)
         st.markdown("### 🎯 Nilai Ideal")
         st.markdown("- 🌡️ Suhu: 22–26°C\n- 💧 Kelembaban: 40–60%\n- 💡 Cahaya: 40–70%\n- 🔊 Kebisingan: <45%")
 
+    if VIEW_MODE == "Semua Kelas":
+        with profiler.section("Grid semua kelas"):
+            render_overview_grid(SERVER_URL)
+        if SHOW_PROFILER:
+            profiler.render()
+        time.sleep(REFRESH_INTERVAL)
+        st.rerun()
+
     # Fetch Sensor Data
-    sensor_data = fetch_sensor_data(SERVER_URL)
+    with profiler.section("Ambil data"):
+        sensor_data = fetch_sensor_data(SERVER_URL, DEVICE_ID)
     if not sensor_data:
         st.warning("⏳ Menunggu data sensor...")
         time.sleep(3)
         st.rerun()
 
-    df = pd.DataFrame(sensor_data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    with profiler.section("Olah DataFrame"):
+        df = pd.DataFrame(sensor_data)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
 
     st.markdown("### 🔍 Data Sensor Terkini")
     col1, col2, col3, col4 = st.columns(4)
@@ -114,17 +131,21 @@ def main():
         ("🔊 Kebisingan", "sound", (0, 45), col4),
     ]
 
-    for label, key, (low, high), col in metrics:
-        val = df.iloc[-1][key]
-        color = "#34a853" if low <= val <= high else "#ea4335"
-        with col:
-            st.markdown(f"<div class='metric-box'><strong>{label}</strong><br><span style='font-size: 1.5rem; color:{color}'>{val:.1f}</span></div>", unsafe_allow_html=True)
-            st.plotly_chart(create_sensor_gauge(val, label, (low, high)), use_container_width=True)
+    with profiler.section("Metrik & gauge"):
+        latest_row = df.iloc[-1]
+        for label, key, (low, high), col in metrics:
+            val = float(latest_row[key])
+            color = "#34a853" if low <= val <= high else "#ea4335"
+            with col:
+                st.markdown(f"<div class='metric-box'><strong>{label}</strong><br><span style='font-size: 1.5rem; color:{color}'>{val:.1f}</span></div>", unsafe_allow_html=True)
+                if SHOW_GAUGES:
+                    st.plotly_chart(create_sensor_gauge(key, val, (low, high)), use_container_width=True)
 
     st.markdown("## 🧠 Rekomendasi AI")
 
     if st.button("✨ Hasilkan Rekomendasi AI"):
         with st.spinner("Menganalisis kondisi kelas..."):
+            engine = get_recommendation_engine()
             st.session_state.recommendations = engine.generate_recommendations(sensor_data)
             st.session_state.show_recommendations = True
 
@@ -136,9 +157,11 @@ def main():
                     st.markdown(line)
 
     st.markdown("## 📈 Tren Data Sensor (24 Jam Terakhir)")
-    fig = px.line(df.tail(24), x='timestamp', y=['temp', 'hum', 'light', 'sound'],
-                 markers=True, title="Trend Lingkungan Kelas")
-    st.plotly_chart(fig, use_container_width=True)
+    with profiler.section("Grafik tren"):
+        st.plotly_chart(create_trend_chart(df.tail(24)), use_container_width=True)
+
+    if SHOW_PROFILER:
+        profiler.render()
 
     # Auto-refresh
     time.sleep(REFRESH_INTERVAL)
@@ -146,20 +169,146 @@ def main():
 
 # ========== FUNGSI BANTUAN ==========
 @st.cache_data(ttl=10)
-def fetch_sensor_data(server_url):
+def fetch_sensor_data(server_url, device_id=""):
     try:
-        res = requests.get(f"{server_url}/api/sensor/latest", timeout=3)
+        params = {"device": device_id} if device_id else None
+        res = requests.get(f"{server_url}/api/sensor/latest", params=params, timeout=3)
         return res.json()["data"] if res.status_code == 200 else []
     except:
         return []
 
-def create_sensor_gauge(value, title, optimal_range):
+@st.cache_data(ttl=10)
+def fetch_overview(server_url):
+    try:
+        res = requests.get(f"{server_url}/api/sensor/overview", timeout=5)
+        return res.json()["data"] if res.status_code == 200 else []
+    except:
+        return []
+
+def render_overview_grid(server_url, columns=4):
+    """Grid kondisi terkini semua kelas dari satu request /api/sensor/overview"""
+    rooms = fetch_overview(server_url)
+    st.markdown(f"### 🏫 Semua Kelas ({len(rooms)})")
+    if not rooms:
+        st.warning("⏳ Belum ada kelas yang mengirim data...")
+        return
+
+    fields = [("🌡️", "temp", "°C"), ("💧", "hum", "%"), ("💡", "light", "%"), ("🔊", "sound", "%")]
+    for start in range(0, len(rooms), columns):
+        for room, col in zip(rooms[start:start + columns], st.columns(columns)):
+            badge = "🟢" if room.get("online") else "⚪"
+            values = []
+            for icon, key, unit in fields:
+                val = room.get(key)
+                if val is None:
+                    values.append(f"{icon} -")
+                    continue
+                color = "#34a853" if room["status"].get(key) == "ok" else "#ea4335"
+                values.append(f"{icon} <span style='color:{color}'>{val:.1f}{unit}</span>")
+            with col:
+                st.markdown(
+                    f"<div class='metric-box'><strong>{badge} {room.get('room') or room['device_id']}</strong><br>"
+                    + "<br>".join(values) + "</div>",
+                    unsafe_allow_html=True
+                )
+
+class EngineUnavailable(Exception):
+    """Gemini gagal diinisialisasi; instance nonaktif dibawa agar tidak ikut di-cache"""
+    def __init__(self, engine):
+        super().__init__("Gemini tidak aktif")
+        self.engine = engine
+
+@st.cache_resource
+def _cached_recommendation_engine():
+    engine = GeminiRecommendationEngine()
+    if not engine.enabled:
+        # Exception membuat st.cache_resource tidak menyimpan hasil, sehingga
+        # kegagalan sementara (mis. list_models) dicoba lagi pada permintaan berikutnya
+        raise EngineUnavailable(engine)
+    return engine
+
+def get_recommendation_engine():
+    """Koneksi ke Gemini dibuat sekali per proses, saat rekomendasi pertama diminta"""
+    try:
+        return _cached_recommendation_engine()
+    except EngineUnavailable as e:
+        return e.engine
+
+def _figure_cache():
+    """Cache figure per sesi; objek Figure tidak dibagi antar pengguna"""
+    if "figure_cache" not in st.session_state:
+        st.session_state.figure_cache = {}
+    return st.session_state.figure_cache
+
+def create_sensor_gauge(key, value, optimal_range):
+    """Gauge go.Indicator; figure dibuat sekali, selanjutnya hanya nilai yang diperbarui"""
     color = "#34a853" if optimal_range[0] <= value <= optimal_range[1] else "#ea4335"
-    fig = px.bar(x=[value], title=f"{title} ({value:.1f})", color_discrete_sequence=[color])
-    fig.update_layout(showlegend=False, margin=dict(l=10, r=10, t=40, b=20), height=150)
-    fig.update_xaxes(range=[0, 100], visible=False)
+    cache = _figure_cache()
+    fig = cache.get(f"gauge_{key}")
+    if fig is None:
+        import plotly.graph_objects as go
+        fig = go.Figure(go.Indicator(
+            mode="gauge+number",
+            value=value,
+            number={"valueformat": ".1f"},
+            gauge={
+                "axis": {"range": [0, 100], "visible": False},
+                "bar": {"color": color},
+                "steps": [{"range": list(optimal_range), "color": "#e8f5e9"}],
+            },
+        ))
+        fig.update_layout(margin=dict(l=10, r=10, t=10, b=10), height=150)
+        cache[f"gauge_{key}"] = fig
+    else:
+        indicator = fig.data[0]
+        indicator.value = value
+        indicator.gauge.bar.color = color
     return fig
 
+def create_trend_chart(df):
+    """Grafik tren; trace dibuat sekali, selanjutnya hanya data x/y yang diganti"""
+    columns = ['temp', 'hum', 'light', 'sound']
+    cache = _figure_cache()
+    fig = cache.get("trend")
+    if fig is None:
+        import plotly.graph_objects as go
+        fig = go.Figure([
+            go.Scatter(x=df['timestamp'], y=df[col], mode="lines+markers", name=col)
+            for col in columns
+        ])
+        fig.update_layout(title="Trend Lingkungan Kelas", xaxis_title="timestamp",
+                          yaxis_title="value", legend_title_text="variable")
+        cache["trend"] = fig
+    else:
+        with fig.batch_update():
+            for trace, col in zip(fig.data, columns):
+                trace.x = df['timestamp']
+                trace.y = df[col]
+    return fig
+
+class RenderProfiler:
+    """Mencatat durasi tiap bagian render dashboard"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.timings = []
+
+    @contextmanager
+    def section(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, (time.perf_counter() - t0) * 1000))
+
+    def render(self):
+        total = (time.perf_counter() - self.start) * 1000
+        with st.expander("⏱️ Profil Render", expanded=False):
+            st.dataframe(
+                pd.DataFrame(self.timings, columns=["Bagian", "Durasi (ms)"]).round(2),
+                use_container_width=True, hide_index=True
+            )
+            st.caption(f"Total render: {total:.1f} ms")
+
 # ========== RUN APLIKASI ==========
 if __name__ == "__main__":
     main()